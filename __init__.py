@@ -4,5 +4,4 @@
 # 2.0
 # TODO: manage shape list
 # TODO: manage color palette
-# TODO: replace shape with auto-scale
 # TODO: dockable window
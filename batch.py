@@ -0,0 +1,271 @@
+"""
+Headless batch processor. Runs shape operations over many scenes, one mayapy process per scene.
+
+Usage (from mayapy):
+    mayapy -m ctrlShaper.batch manifest.json --jobs 4
+
+Manifest:
+{
+    "jobs": [
+        {
+            "scene": "rigs/hero.ma",
+            "steps": [
+                {"op": "import", "file": "shapes/hero.ctrl", "filter": [], "shapes": true, "color": true},
+                {"op": "recolor", "color": [1, 0, 0], "dags": ["*_L_ctl"]},
+                {"op": "mirror", "dags": ["*_L_ctl"], "search": "_L", "replace": "_R", "axis": "x"},
+                {"op": "simplify", "dags": ["*_ctl"], "tolerance": 0.01},
+                {"op": "export", "file": "shapes/hero_out.ctrl", "dags": ["*_ctl"]}
+            ],
+            "save": true,
+            "output": ""
+        }
+    ]
+}
+Relative paths are resolved from the manifest's directory. If 'output' is set, the scene is saved there instead of in
+place. Each job prints one json line (scene, status, seconds, steps, error). Exit code is 0 if every job succeeded,
+1 if any failed and 2 if the manifest is invalid.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from multiprocessing.pool import ThreadPool
+
+
+operations = ('import', 'export', 'recolor', 'mirror', 'simplify')
+
+# fields each operation requires. A tuple means at least one of them
+requiredFields = {
+    'import': ('file',),
+    'export': ('file', 'dags'),
+    'recolor': ('color', 'dags'),
+    'mirror': ('dags',),
+    'simplify': ('dags', ('count', 'tolerance')),
+}
+
+
+def loadManifest(filePath):
+    """
+    Load a manifest and resolve its relative paths.
+    :param filePath: (str)
+    :return: jobs (List[dict])
+    """
+    with open(filePath, 'r') as f:
+        manifest = json.load(f)
+
+    rootDir = os.path.dirname(os.path.abspath(filePath))
+
+    def resolve(path):
+        return path if not path or os.path.isabs(path) else os.path.normpath(os.path.join(rootDir, path))
+
+    jobs = manifest.get('jobs', list())
+    for job in jobs:
+        if 'scene' not in job:
+            raise ValueError('Job without scene: {}'.format(repr(job)))
+        job['scene'] = resolve(job['scene'])
+        job['output'] = resolve(job.get('output', ''))
+        for step in job.get('steps', list()):
+            if step.get('op') not in operations:
+                raise ValueError('Unknown operation {}. Expected one of {}'.format(repr(step.get('op')), operations))
+            for field in requiredFields[step['op']]:
+                fields = field if isinstance(field, tuple) else (field,)
+                if not any(step.get(f) is not None for f in fields):
+                    raise ValueError('{} step expects {}: {}'.format(
+                        repr(step['op']), ' or '.join(repr(f) for f in fields), repr(step)
+                    ))
+            if 'file' in step:
+                step['file'] = resolve(step['file'])
+
+    return jobs
+
+
+def runStep(step):
+    """
+    Run one step in the current maya session.
+    :param step: (dict)
+    :return:
+    """
+    from maya import cmds
+    from ctrlShaper import core
+
+    op = step['op']
+    dags = cmds.ls(step.get('dags', list()), type='transform', long=op != 'mirror') if step.get('dags') else list()
+
+    if op == 'import':
+        core.importCurves(
+            step['file'], selectionFilter=step.get('filter', tuple()), shapes=step.get('shapes', True),
+            color=step.get('color', True)
+        )
+    elif op == 'export':
+        core.exportCurves(dags, step['file'])
+    elif op == 'recolor':
+        if not dags:
+            raise ValueError('Nothing to recolor.')
+        color = step.get('color')
+        core.setOverrideColors(tuple(color) if isinstance(color, list) else color, dags=dags)
+    elif op == 'mirror':
+        core.mirrorCurves(
+            dags, search=step.get('search', '_L'), replace=step.get('replace', '_R'), axis=step.get('axis', 'x')
+        )
+    elif op == 'simplify':
+        core.simplifyCurves(dags, count=step.get('count'), tolerance=step.get('tolerance'))
+
+
+def runJob(job):
+    """
+    Open a scene, run the job's steps and save it. Expects to be run in a mayapy process.
+    :param job: (dict)
+    :return: report (dict)
+    """
+    from maya import cmds
+    from ctrlShaper.core import NoUndo
+
+    start = time.time()
+    report = {'scene': job['scene'], 'status': 'ok', 'steps': list(), 'error': None}
+
+    try:
+        cmds.file(job['scene'], open=True, force=True)
+        with NoUndo():
+            for step in job.get('steps', list()):
+                stepStart = time.time()
+                runStep(step)
+                report['steps'].append({'op': step['op'], 'seconds': time.time() - stepStart})
+
+        if job.get('output'):
+            cmds.file(rename=job['output'])
+            cmds.file(save=True, force=True)
+        elif job.get('save'):
+            cmds.file(save=True, force=True)
+    except Exception as e:
+        report['status'] = 'failed'
+        report['error'] = '{}: {}'.format(e.__class__.__name__, e)
+
+    report['seconds'] = time.time() - start
+    return report
+
+
+def runWorker(jobPath, resultPath):
+    """
+    Entry point of a worker process: initialize maya standalone, run one job and write its report.
+    :param jobPath: json file containing the job (str)
+    :param resultPath: json file the report is written to (str)
+    :return: exit code (int)
+    """
+    from maya import standalone
+    standalone.initialize()
+
+    start = time.time()
+    try:
+        with open(jobPath, 'r') as f:
+            job = json.load(f)
+        report = runJob(job)
+    except Exception as e:
+        report = {
+            'scene': None, 'status': 'failed', 'steps': list(), 'seconds': time.time() - start,
+            'error': '{}: {}'.format(e.__class__.__name__, e)
+        }
+    finally:
+        standalone.uninitialize()
+
+    with open(resultPath, 'w') as f:
+        json.dump(report, f)
+
+    return 0 if report['status'] == 'ok' else 1
+
+
+def spawnJob(job, executable=sys.executable):
+    """
+    Run a job in its own process.
+    :param job: (dict)
+    :param executable: mayapy executable (str)
+    :return: report (dict)
+    """
+    start = time.time()
+    jobFd, jobPath = tempfile.mkstemp(suffix='.json')
+    resultFd, resultPath = tempfile.mkstemp(suffix='.json')
+    os.close(resultFd)
+
+    env = dict(os.environ)
+    packageRoot = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env['PYTHONPATH'] = os.pathsep.join(x for x in (packageRoot, env.get('PYTHONPATH')) if x)
+
+    try:
+        with os.fdopen(jobFd, 'w') as f:
+            json.dump(job, f)
+
+        process = subprocess.Popen(
+            [executable, '-m', 'ctrlShaper.batch', '--worker', jobPath, resultPath],
+            env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT
+        )
+        output, _ = process.communicate()
+
+        try:
+            with open(resultPath, 'r') as f:
+                report = json.load(f)
+            report['scene'] = report.get('scene') or job['scene']
+            return report
+        except ValueError:
+            return {
+                'scene': job['scene'], 'status': 'failed', 'steps': list(), 'seconds': time.time() - start,
+                'error': 'Worker exited with code {}: {}'.format(process.returncode, output.decode('utf-8', 'replace')[-2000:])
+            }
+    finally:
+        os.remove(jobPath)
+        os.remove(resultPath)
+
+
+def run(jobs, concurrency=1, executable=sys.executable, stream=sys.stdout):
+    """
+    Run jobs, each one in its own process, and print a json report line per job as they finish.
+    :param jobs: (List[dict])
+    :param concurrency: number of scenes processed at the same time (int)
+    :param executable: mayapy executable (str)
+    :param stream: where reports are written (file)
+    :return: reports (List[dict])
+    """
+    pool = ThreadPool(max(1, concurrency))
+    reports = list()
+    try:
+        for report in pool.imap_unordered(lambda j: spawnJob(j, executable=executable), jobs):
+            stream.write(json.dumps(report) + '\n')
+            stream.flush()
+            reports.append(report)
+    finally:
+        pool.close()
+        pool.join()
+    return reports
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(prog='ctrlShaper.batch', description='Run shape operations over many scenes.')
+    parser.add_argument('manifest', nargs='?', help='json manifest describing the jobs')
+    parser.add_argument('-j', '--jobs', type=int, default=1, help='number of scenes processed concurrently')
+    parser.add_argument('--mayapy', default=sys.executable, help='mayapy executable used by the workers')
+    parser.add_argument('--worker', nargs=2, metavar=('JOB', 'RESULT'), help=argparse.SUPPRESS)
+    args = parser.parse_args(args)
+
+    if args.worker:
+        return runWorker(*args.worker)
+
+    if not args.manifest:
+        parser.error('the manifest is required')
+
+    try:
+        jobs = loadManifest(args.manifest)
+    except (IOError, ValueError) as e:
+        sys.stderr.write('Invalid manifest: {}\n'.format(e))
+        return 2
+
+    start = time.time()
+    reports = run(jobs, concurrency=args.jobs, executable=args.mayapy)
+    failed = [r for r in reports if r['status'] != 'ok']
+    sys.stderr.write('{} job(s), {} failed, {:.2f}s\n'.format(len(reports), len(failed), time.time() - start))
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
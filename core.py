@@ -1,19 +1,58 @@
 from maya import cmds
+from maya.api import OpenMaya
+import maya.utils
 import json
 import itertools
+import functools
+import math
+import os
+import threading
+import time
+
+
+shapesPath = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src', 'shapes.json')
+_shapesCache = dict()
+_controllersCache = dict()
+# kept across reload() so the callbacks registered by the previous module can be removed
+_controllersCallbacks = globals().get('_controllersCallbacks') or list()
+_controllersWatched = False
+_appliedCurves = list()
 
 class Chunk(object):
     """
-    Make sure a group of maya instructions gets undone together. To use with 'with' statement
+    Make sure a group of maya instructions gets undone together. To use with 'with' statement.
+    Chunks are reentrant: only the outermost one actually opens an undo chunk.
     """
+    depth = 0
+
     def __init__(self, name=''):
         self.name = str(name)
 
     def __enter__(self):
-        cmds.undoInfo(openChunk=True, chunkName=self.name)
+        if not Chunk.depth:
+            cmds.undoInfo(openChunk=True, chunkName=self.name)
+        Chunk.depth += 1
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        Chunk.depth -= 1
+        if not Chunk.depth:
+            cmds.undoInfo(closeChunk=True)
+
+
+class NoUndo(object):
+    """
+    Disable undo recording for a group of maya instructions, then restore the previous state. To use with 'with'
+    statement. Meant for batch and farm use where nothing has to be undone.
+    """
+    def __init__(self):
+        self.state = True
+
+    def __enter__(self):
+        self.state = cmds.undoInfo(q=True, stateWithoutFlush=True)
+        cmds.undoInfo(stateWithoutFlush=False)
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        cmds.undoInfo(closeChunk=True)
+        cmds.undoInfo(stateWithoutFlush=self.state)
 
 
 def chunk(func):
@@ -22,6 +61,7 @@ def chunk(func):
     :param func:
     :return:
     """
+    @functools.wraps(func)
     def wrapper(*args, **kwargs):
         with Chunk(name=func.__name__):
             return func(*args, **kwargs)
@@ -41,10 +81,394 @@ def scaleCurves(dags, factor):
 
 @chunk
 def scaleCurve(curve, factor):
+    if isImportLocked(curve):
+        return
     scaledPoints = [[v * factor for v in p] for p in getCurveData(curve)[0]]
     [cmds.xform('{}.cv[{}]'.format(curve, i), translation=p) for i, p in enumerate(scaledPoints)]
 
 
+def getPointsSize(points):
+    """
+    Get the largest dimension of the bounding box enclosing the given points.
+    :param points: (List[List[float, float, float]])
+    :return: size (float)
+    """
+    if not points:
+        return 0.0
+    return max(max(axis) - min(axis) for axis in zip(*points))
+
+
+def getShapeSize(data):
+    """
+    Get the size of a shape. Uses the precomputed 'size' entry of library shapes when available.
+    :param data: shape data (dict) or shapes data (List[dict])
+    :return: size (float)
+    """
+    data = [data] if isinstance(data, dict) else data
+    sizes = [d['size'] if 'size' in d else getPointsSize(d.get('points', tuple())) for d in data]
+    return max(sizes) if sizes else 0.0
+
+
+def getLibraryShapes(path=shapesPath, tolerance=None):
+    """
+    Load a shape library. Each shape gets its 'size' precomputed. The result is cached until the file changes.
+    :param path: json file path (str)
+    :param tolerance: if given, shapes are simplified with this tolerance. See simplifyPoints (float)
+    :return: shapes data by name (dict)
+    """
+    mtime = os.path.getmtime(path)
+    cached = _shapesCache.get((path, tolerance))
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    with open(path, 'r') as f:
+        shapesData = json.load(f)
+
+    for data in shapesData.values():
+        if tolerance:
+            data['points'] = simplifyPoints(
+                data.get('points', tuple()), degree=data.get('degree', 1), periodic=data.get('periodic', False),
+                tolerance=tolerance
+            )
+        data['size'] = getPointsSize(data.get('points', tuple()))
+
+    _shapesCache[(path, tolerance)] = mtime, shapesData
+    return shapesData
+
+
+def getDrivenDags(ctrl):
+    """
+    Get the joints and meshes driven by a controller, either directly or through constraints.
+    :param ctrl: (str)
+    :return: driven dags (List[str])
+    """
+    driven = list()
+    outputs = cmds.listConnections(ctrl, source=False, destination=True) or list()
+    if not outputs:
+        return driven
+
+    constraints = cmds.ls(outputs, type='constraint') or list()
+    for constraint in constraints:
+        outputs += [x for x in cmds.listConnections(constraint, source=False, destination=True) or list() if x != constraint]
+
+    for dag in cmds.ls(outputs, type='transform', long=True) or list():
+        if dag in driven or cmds.ls(dag, type='constraint'):
+            continue
+        if cmds.ls(dag, type='joint') or cmds.listRelatives(dag, shapes=True, type='mesh'):
+            driven.append(dag)
+
+    return driven
+
+
+def _getDagBoundingBox(dagPath, curvesOnly=False):
+    """
+    Get the world space bounding box of a joint or a transform's visible curves and meshes.
+    :param dagPath: (OpenMaya.MDagPath)
+    :param curvesOnly: only measure the curves under the dag, even if it is a joint (bool)
+    :return: (OpenMaya.MBoundingBox) or None
+    """
+    bbox = None
+
+    if dagPath.hasFn(OpenMaya.MFn.kJoint) and not curvesOnly:
+        radius = OpenMaya.MFnDagNode(dagPath).findPlug('radius', False).asDouble()
+        points = [OpenMaya.MPoint(list(dagPath.inclusiveMatrix())[12:15])]
+        for i in range(dagPath.childCount()):
+            child = dagPath.child(i)
+            if child.hasFn(OpenMaya.MFn.kJoint):
+                childPath = OpenMaya.MDagPath.getAPathTo(child)
+                points.append(OpenMaya.MPoint(list(childPath.inclusiveMatrix())[12:15]))
+        bbox = OpenMaya.MBoundingBox()
+        for point in points:
+            bbox.expand(point)
+        bbox.expand(bbox.min - OpenMaya.MVector(radius, radius, radius))
+        bbox.expand(bbox.max + OpenMaya.MVector(radius, radius, radius))
+        return bbox
+
+    for i in range(dagPath.numberOfShapesDirectlyBelow()):
+        shapePath = OpenMaya.MDagPath(dagPath)
+        shapePath.extendToShape(i)
+        if not (shapePath.hasFn(OpenMaya.MFn.kNurbsCurve) or shapePath.hasFn(OpenMaya.MFn.kMesh) and not curvesOnly):
+            continue
+        shapeFn = OpenMaya.MFnDagNode(shapePath)
+        if shapeFn.isIntermediateObject:
+            continue
+        shapeBBox = shapeFn.boundingBox
+        shapeBBox.transformUsing(shapePath.inclusiveMatrix())
+        if bbox is None:
+            bbox = shapeBBox
+        else:
+            bbox.expand(shapeBBox)
+
+    return bbox
+
+
+def getFitSizes(ctrls, fit='curves'):
+    """
+    Get in one pass the size each controller's shapes should fit, in the controller's object space.
+    :param ctrls: (List[str])
+    :param fit: 'curves' to fit the controller's current curves, 'driven' to fit the joints or meshes it drives (str)
+    :return: size by controller, None when nothing to fit was found (dict)
+    """
+    if fit not in ('curves', 'driven'):
+        raise ValueError('\'curves\' or \'driven\' expected as fit. Got {}'.format(repr(fit)))
+
+    targets = {c: [c] if fit == 'curves' else getDrivenDags(c) for c in ctrls}
+
+    selectionList = OpenMaya.MSelectionList()
+    dags = list()
+    for dag in itertools.chain(ctrls, *targets.values()):
+        if dag in dags:
+            continue
+        selectionList.add(dag)
+        dags.append(dag)
+    dagPaths = {dag: selectionList.getDagPath(i) for i, dag in enumerate(dags)}
+
+    sizes = dict()
+    for ctrl in ctrls:
+        sizes[ctrl] = None
+        bboxes = [_getDagBoundingBox(dagPaths[t], curvesOnly=fit == 'curves') for t in targets[ctrl]]
+        bboxes = [b for b in bboxes if b is not None]
+        if not bboxes:
+            continue
+
+        ctrlMatrix = dagPaths[ctrl].inclusiveMatrixInverse()
+        bbox = OpenMaya.MBoundingBox()
+        for b in bboxes:
+            b.transformUsing(ctrlMatrix)
+            bbox.expand(b)
+        sizes[ctrl] = max(bbox.width, bbox.height, bbox.depth) or None
+
+    return sizes
+
+
+@chunk
+def replaceShapes(ctrls, data, scale=1.0, fit='', applyColor=False):
+    """
+    Replace the curves of several controllers by the same shape.
+    :param ctrls: (List[str])
+    :param data: shape data (dict)
+    :param scale: fixed scale, or scale multiplier of the fitted size when fit is used (float)
+    :param fit: '', 'curves' or 'driven'. See getFitSizes (str)
+    :param applyColor: (bool)
+    :return:
+    """
+    shapeSize = getShapeSize(data) if fit else 0.0
+    fitSizes = getFitSizes(ctrls, fit=fit) if fit and shapeSize else dict()
+
+    if fit:
+        unfitted = [c for c in ctrls if not fitSizes.get(c)]
+        if unfitted:
+            cmds.warning('Nothing to fit for {}. Scale used as is.'.format(', '.join(unfitted)))
+
+    for ctrl in ctrls:
+        fitSize = fitSizes.get(ctrl)
+        ctrlScale = scale * fitSize / shapeSize if fitSize else scale
+        replaceCurves(ctrl, [dict(data, scale=ctrlScale)], applyColor=applyColor)
+
+
+def _deBoor(span, t, knots, cvs, degree):
+    """
+    Evaluate a b-spline at t, inside the given knot span.
+    """
+    points = [list(cvs[j + span - degree]) for j in range(degree + 1)]
+    for r in range(1, degree + 1):
+        for j in range(degree, r - 1, -1):
+            low, high = knots[j + span - degree], knots[j + 1 + span - r]
+            alpha = (t - low) / (high - low) if high != low else 0.0
+            points[j] = [(1 - alpha) * a + alpha * b for a, b in zip(points[j - 1], points[j])]
+    return points[degree]
+
+
+def sampleCurve(points, degree=1, periodic=False, samples=8):
+    """
+    Sample a curve the way maya builds it: open curves have clamped uniform knots, periodic curves uniform knots.
+    :param points: (List[List[float, float, float]])
+    :param degree: (int)
+    :param periodic: (bool)
+    :param samples: samples per span (int)
+    :return: points (List[List[float, float, float]])
+    """
+    if degree < 2 or len(points) <= degree:
+        return list(points) + [points[0]] if periodic and points else list(points)
+
+    if periodic:
+        cvs = list(points) + list(points[:degree])
+        knots = list(range(len(cvs) + degree + 1))
+    else:
+        cvs = list(points)
+        inner = len(cvs) - degree
+        knots = [0] * degree + list(range(inner + 1)) + [inner] * degree
+
+    spans = [k for k in range(degree, len(cvs)) if knots[k] < knots[k + 1]]
+    result = list()
+    for span in spans:
+        low, high = knots[span], knots[span + 1]
+        for n in range(samples + 1 if span == spans[-1] else samples):
+            result.append(_deBoor(span, low + (high - low) * n / float(samples), knots, cvs, degree))
+    return result
+
+
+def _distance(a, b):
+    return math.sqrt(sum((x - y) ** 2 for x, y in zip(a, b)))
+
+
+def _segmentDistance(point, a, b):
+    """
+    Distance between a point and a segment.
+    """
+    ab = [y - x for x, y in zip(a, b)]
+    lengthSq = sum(v * v for v in ab)
+    if not lengthSq:
+        return _distance(point, a)
+    t = max(0.0, min(1.0, sum((p - x) * v for p, x, v in zip(point, a, ab)) / lengthSq))
+    return _distance(point, [x + v * t for x, v in zip(a, ab)])
+
+
+def _decimatePolyline(points, periodic=False, count=None, tolerance=None):
+    """
+    Remove, one at a time, the point whose removal moves the polyline the least, until count is reached or the
+    next removal would exceed tolerance. Only the neighbours' errors are updated after each removal.
+    """
+    minCount = 3 if periodic else 2
+    kept = list(range(len(points)))
+
+    def removalError(k):
+        if not periodic and (k == 0 or k == len(kept) - 1):
+            return float('inf')
+        previous, next_ = kept[k - 1], kept[(k + 1) % len(kept)]
+        span = range(previous + 1, next_) if previous < next_ else \
+            list(range(previous + 1, len(points))) + list(range(next_))
+        return max(_segmentDistance(points[i], points[previous], points[next_]) for i in span) if span else 0.0
+
+    errors = [removalError(k) for k in range(len(kept))]
+
+    while len(kept) > max(minCount, count or 0):
+        error, k = min((e, k) for k, e in enumerate(errors))
+        if count is None and error > tolerance:
+            break
+        kept.pop(k)
+        errors.pop(k)
+        for neighbour in (k - 1, k % len(kept)):
+            errors[neighbour] = removalError(neighbour)
+
+    return [points[i] for i in kept]
+
+
+def resamplePoints(points, count, periodic=False):
+    """
+    Resample points evenly along the polyline they describe.
+    :param points: (List[List[float, float, float]])
+    :param count: number of points wanted (int)
+    :param periodic: if True the polyline is closed (bool)
+    :return: points (List[List[float, float, float]])
+    """
+    polyline = list(points) + [points[0]] if periodic else list(points)
+    lengths = [0.0]
+    for a, b in zip(polyline, polyline[1:]):
+        lengths.append(lengths[-1] + _distance(a, b))
+
+    total = lengths[-1]
+    if not total or count < 2:
+        return list(points[:count])
+
+    step = total / (count if periodic else count - 1)
+    result = list()
+    segment = 0
+    for n in range(count):
+        length = min(n * step, total)
+        while segment < len(polyline) - 2 and lengths[segment + 1] < length:
+            segment += 1
+        segmentLength = lengths[segment + 1] - lengths[segment]
+        t = (length - lengths[segment]) / segmentLength if segmentLength else 0.0
+        a, b = polyline[segment], polyline[segment + 1]
+        result.append([x + (y - x) * t for x, y in zip(a, b)])
+
+    return result
+
+
+def _curveDeviation(reference, candidate, periodic=False):
+    """
+    Maximum distance between two sampled curves, matched by arc length. Cheap, and never less than the actual
+    distance between the curves. Closed curves are first aligned on the reference's starting point.
+    """
+    if periodic:
+        loop = candidate[:-1]
+        start = min(range(len(loop)), key=lambda i: _distance(loop[i], reference[0]))
+        candidate = loop[start:] + loop[:start] + [loop[start]]
+
+    count = max(len(reference), len(candidate))
+    return max(_distance(a, b) for a, b in zip(resamplePoints(reference, count), resamplePoints(candidate, count)))
+
+
+def simplifyPoints(points, degree=1, periodic=False, count=None, tolerance=None):
+    """
+    Reduce the number of CVs of a curve, keeping its degree and periodicity. Linear curves lose their least
+    significant points, higher degree curves are resampled evenly along their control polygon, the CV count
+    satisfying the tolerance being found by bisection.
+    :param points: (List[List[float, float, float]])
+    :param degree: (int)
+    :param periodic: (bool)
+    :param count: number of CVs wanted. Curves never gain CVs (int)
+    :param tolerance: maximum distance allowed between the original and the simplified curve, used if no count (float)
+    :return: points (List[List[float, float, float]])
+    """
+    if count is None and tolerance is None:
+        raise ValueError('A count or a tolerance is expected.')
+
+    points = [list(p) for p in points]
+    if count is not None and count >= len(points):
+        return points
+
+    if degree < 2:
+        return _decimatePolyline(points, periodic=periodic, count=count, tolerance=tolerance)
+
+    minCount = degree + 1
+    if count is not None:
+        return resamplePoints(points, max(minCount, count), periodic=periodic)
+
+    reference = sampleCurve(points, degree=degree, periodic=periodic)
+    best = points
+    low, high = minCount, len(points) - 1
+    while low <= high:
+        n = (low + high) // 2
+        candidate = resamplePoints(points, n, periodic=periodic)
+        samples = sampleCurve(candidate, degree=degree, periodic=periodic)
+        if _curveDeviation(reference, samples, periodic=periodic) <= tolerance:
+            best, high = candidate, n - 1
+        else:
+            low = n + 1
+
+    return best
+
+
+@chunk
+def simplifyCurves(dags, count=None, tolerance=None):
+    """
+    Simplify the curves of the given controllers. See simplifyPoints.
+    :param dags: (List[str])
+    :param count: (int)
+    :param tolerance: (float)
+    :return: simplified controllers (List[str])
+    """
+    simplified = list()
+    if not dags:
+        return simplified
+
+    for ctrl in cmds.ls(dags, type='transform', long=True):
+        data = getCurvesData(ctrl)
+        changed = False
+        for d in data:
+            points = simplifyPoints(d['points'], degree=d['degree'], periodic=d['periodic'], count=count, tolerance=tolerance)
+            changed = changed or len(points) < len(d['points'])
+            d['points'] = points
+
+        if changed:
+            replaceCurves(ctrl, data, applyColor=True)
+            simplified.append(ctrl)
+
+    return simplified
+
+
 @chunk
 def setOverrideColors(color, dags=tuple()):
     """
@@ -65,6 +489,122 @@ def setOverrideColors(color, dags=tuple()):
     [setOverrideColor(x, color) for x in curves]
 
 
+def clearControllersCache(*args):
+    """
+    Forget the cached tagged controllers. Called by maya whenever the scene changes in a way that affects them.
+    :return:
+    """
+    _controllersCache.clear()
+
+
+def _clearControllersCacheOnReparent(child, parent, *args):
+    """
+    Clear the tagged controllers cache when a reparented transform is a tagged controller or one of their ancestors,
+    as their long names change. Reparented shapes, such as the curves added by addCurve, are ignored.
+    """
+    if 'controllers' not in _controllersCache or not child.hasFn(OpenMaya.MFn.kTransform):
+        return
+    if child.partialPathName().split('|')[-1] in _controllersCache['controllers'][2]:
+        clearControllersCache()
+
+
+def removeControllersCallbacks():
+    """
+    Remove the callbacks registered by _watchControllers.
+    :return:
+    """
+    global _controllersWatched
+
+    if _controllersCallbacks:
+        OpenMaya.MMessage.removeCallbacks(_controllersCallbacks)
+        del _controllersCallbacks[:]
+    _controllersWatched = False
+    clearControllersCache()
+
+
+def _watchControllers():
+    """
+    Register the callbacks clearing the tagged controllers cache (controllers added/removed, renames, reparenting of
+    controllers or their ancestors, new or opened scene). Done once per session, or again after a reload, the previous
+    callbacks being removed first.
+    :return:
+    """
+    global _controllersWatched
+
+    if _controllersWatched:
+        return
+
+    removeControllersCallbacks()
+    _controllersCallbacks.extend((
+        OpenMaya.MDGMessage.addNodeAddedCallback(clearControllersCache, 'controller'),
+        OpenMaya.MDGMessage.addNodeRemovedCallback(clearControllersCache, 'controller'),
+        OpenMaya.MDagMessage.addParentAddedCallback(_clearControllersCacheOnReparent),
+        OpenMaya.MEventMessage.addEventCallback('NameChanged', clearControllersCache),
+        OpenMaya.MSceneMessage.addCallback(OpenMaya.MSceneMessage.kAfterNew, clearControllersCache),
+        OpenMaya.MSceneMessage.addCallback(OpenMaya.MSceneMessage.kAfterOpen, clearControllersCache),
+    ))
+    _controllersWatched = True
+
+
+def _getTaggedControllers():
+    """
+    Get every tagged controller of the scene. The result is cached until the scene changes.
+    :return: long names (List[str]), membership set (frozenset)
+    """
+    _watchControllers()
+
+    if 'controllers' not in _controllersCache:
+        ctrls = cmds.controller(q=True, allControllers=True) or list()
+        if ctrls:
+            ctrls = cmds.ls(ctrls, long=True) or list()
+        names = frozenset(n for c in ctrls for n in c.split('|') if n)
+        _controllersCache['controllers'] = ctrls, frozenset(ctrls), names
+
+    return _controllersCache['controllers'][:2]
+
+
+def getTaggedControllers(namespace=None, root=None):
+    """
+    Get tagged controllers, optionally filtered.
+    :param namespace: only keep controllers in this namespace, '' for the root namespace (str)
+    :param root: only keep controllers that are or are under this dag (str)
+    :return: long names (List[str])
+    """
+    ctrls = _getTaggedControllers()[0]
+
+    if namespace is not None:
+        namespace = namespace.strip(':')
+        ctrls = [c for c in ctrls if c.rsplit('|', 1)[-1].rpartition(':')[0].lstrip(':') == namespace]
+
+    if root:
+        rootLong = (cmds.ls(root, long=True) or [None])[0]
+        if not rootLong:
+            cmds.warning('Unable to find {}.'.format(repr(root)))
+            return list()
+        ctrls = [c for c in ctrls if c == rootLong or c.startswith(rootLong + '|')]
+
+    return ctrls
+
+
+@chunk
+def tagControllers(dags):
+    """
+    Tag the given transforms as controllers, skipping the ones already tagged.
+    :param dags: (List[str])
+    :return: newly tagged transforms (List[str])
+    """
+    if not dags:
+        return list()
+
+    tagged = _getTaggedControllers()[1]
+    toTag = [d for d in cmds.ls(dags, type='transform', long=True) if d not in tagged]
+
+    if toTag:
+        cmds.controller(toTag)
+
+    return toTag
+
+
 def getCurveData(curve, objectSpace=True):
     """
     Get curve data such as points, degree and periodicity.
@@ -82,6 +622,24 @@ def getCurveData(curve, objectSpace=True):
     return points, degree, periodic
 
 
+def orientPoints(points, normal=''):
+    """
+    Orient shape points, modeled facing y, so they face the given axis.
+    :param points: (List[List[float, float, float]])
+    :param normal: controller's facing axes (str) -> '', 'x', 'y', 'z'
+    :return: points (List[List[float, float, float]])
+    """
+    if normal == 'x':
+        return [(y, z, x) for x, y, z in points]
+    elif normal == 'y':
+        return [(x, y, z) for x, y, z in points]
+    elif normal == 'z':
+        return [(z, x, y) for x, y, z in points]
+    elif not normal:
+        return points
+    raise ValueError('\'x\', \'y\' or \'z\' excepted as axes. Got {}'.format(repr(normal)))
+
+
 @chunk
 def addCurve(parent, points=tuple(), degree=1, periodic=False, scale=1.0, normal=''):
     """
@@ -95,18 +653,7 @@ def addCurve(parent, points=tuple(), degree=1, periodic=False, scale=1.0, normal
     :return: shapes (List[str])
     """
     points = [[v * scale for v in p] for p in points] if scale != 1 else points
-
-    # normal
-    if normal == 'x':
-        points = [(y, z, x) for x, y, z in points]
-    elif normal == 'y':
-        points = [(x, y, z) for x, y, z in points]
-    elif normal == 'z':
-        points = [(z, x, y) for x, y, z in points]
-    elif not normal:
-        pass
-    else:
-        raise ValueError('\'x\', \'y\' or \'z\' excepted as axes. Got {}'.format(repr(normal)))
+    points = orientPoints(points, normal)
 
     # Create Curve
     curve = cmds.curve(point=points, degree=degree)
@@ -136,6 +683,9 @@ def replaceCurves(ctrl, data, applyColor=True, applyShapes=True):
     :param applyShapes: choose to apply shapes or not (bool)
     :return:
     """
+    if isImportLocked(ctrl):
+        return
+
     oldShapes = cmds.listRelatives(ctrl, shapes=True, fullPath=True, type='nurbsCurve') or list()
     oldColors = [getOverrideColor(s) for s in oldShapes]
 
@@ -155,6 +705,46 @@ def replaceCurves(ctrl, data, applyColor=True, applyShapes=True):
         setOverrideColor(s, c) if applyColor else setOverrideColor(s, o)
 
 
+@chunk
+def mirrorCurves(dags, search='_L', replace='_R', axis='x'):
+    """
+    Mirror the curves of the given controllers onto their counterparts found by name.
+    :param dags: source controllers (List[str])
+    :param search: (str)
+    :param replace: (str)
+    :param axis: worldSpace mirror axis (str) -> '', 'x', 'y', 'z'
+    :return: mirrored controllers (List[str])
+    """
+    if axis not in ('', 'x', 'y', 'z'):
+        raise ValueError('\'x\', \'y\', \'z\' or \'\' excepted as axis. Got {}'.format(repr(axis)))
+
+    signs = [-1 if a == axis else 1 for a in ('x', 'y', 'z')]
+    mirrored = list()
+
+    for dag in dags:
+        mirrorName = dag.replace(search, replace)
+        if not cmds.objExists(mirrorName) or mirrorName == dag:
+            cmds.warning('No mirror object found')
+            continue
+
+        data = getCurvesData(dag, objectSpace=False)
+
+        mirrorMatrix = OpenMaya.MMatrix(cmds.xform(mirrorName, q=True, matrix=True, worldSpace=True)).inverse()
+        for d in data:
+            points = list()
+            for point in d['points']:
+                x, y, z = [v * s for v, s in zip(point, signs)]
+                worldPoint = OpenMaya.MMatrix((1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1, 0, x, y, z, 1))
+                resultMatrix = worldPoint * mirrorMatrix
+                points.append((list(resultMatrix)[12:15]))
+            d['points'] = points
+
+        replaceCurves(mirrorName, data, applyColor=False)
+        mirrored.append(mirrorName)
+
+    return mirrored
+
+
 def getCurvesData(ctrl, objectSpace=True):
     """
     Get curves data of the given ctrl
@@ -202,6 +792,8 @@ def setOverrideColor(dag, color=None):
     :param color: indexColor (int) or rgbColor (List[float, float, float])
     :return:
     """
+    if isImportLocked(dag):
+        return
 
     if color is None:
         enabled = False
@@ -239,6 +831,33 @@ def exportCurves(dags, filePath):
         json.dump(data, f)
 
 
+def readCurvesFile(filePath):
+    """
+    Read curves from a json file. Doesn't touch the scene, so it is safe to call from any thread.
+    :param filePath: (str)
+    :return: curves data by controller (dict)
+    """
+    with open(filePath, 'r') as f:
+        return json.load(f)
+
+
+def importCurve(ctrl, data, shapes=True, color=True):
+    """
+    Apply imported curves onto a controller.
+    :param ctrl: (str)
+    :param data: (List[dict])
+    :param shapes: apply shapes (bool)
+    :param color: apply colors (bool)
+    :return: True if the controller was found (bool)
+    """
+    if not cmds.objExists(ctrl):
+        cmds.warning('Unable to find {}. Skip...'.format(repr(ctrl)))
+        return False
+
+    replaceCurves(ctrl, data, applyColor=color, applyShapes=shapes)
+    return True
+
+
 @chunk
 def importCurves(filePath, selectionFilter=tuple(), shapes=True, color=True):
     """
@@ -249,16 +868,165 @@ def importCurves(filePath, selectionFilter=tuple(), shapes=True, color=True):
     :param color: apply colors (bool)
     :return:
     """
-    with open(filePath, 'r') as f:
-        data = json.load(f)
+    data = readCurvesFile(filePath)
 
     for n, d in data.items():
         if selectionFilter:
             if n not in selectionFilter:
                 continue
 
-        if not cmds.objExists(n):
-            cmds.warning('Unable to find {}. Skip...'.format(repr(n)))
-            continue
+        importCurve(n, d, shapes=shapes, color=color)
+
+
+def isImportLocked(dag):
+    """
+    Check if a controller, or the controller of a curve, is waiting to be applied by a CurvesImporter. Such
+    controllers shouldn't be edited until the import is done.
+    :param dag: (str)
+    :return: (bool)
+    """
+    if not CurvesImporter.lockedCtrls or CurvesImporter.applying:
+        return False
+
+    node = (cmds.ls(dag, long=True) or [dag])[0]
+    if cmds.objectType(node, isAType='shape'):
+        node = (cmds.listRelatives(node, parent=True, fullPath=True) or [node])[0]
+
+    if node in CurvesImporter.lockedCtrls:
+        cmds.warning('{} is being imported. Skip...'.format(repr(node)))
+        return True
+    return False
+
+
+def popAppliedCurves():
+    """
+    Get the records of the oldest finished import. Used by the ctrlShaperApplyCurves command (see curvesCommand).
+    :return: (ctrl, curves data before import, imported data, shapes, color) (List[tuple])
+    """
+    return _appliedCurves.pop(0) if _appliedCurves else list()
+
+
+def loadCurvesCommand():
+    """
+    Load the plugin providing the ctrlShaperApplyCurves command.
+    :return: True if the command is available (bool)
+    """
+    pluginPath = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'curvesCommand.py')
+    if not cmds.pluginInfo(pluginPath, q=True, loaded=True):
+        try:
+            cmds.loadPlugin(pluginPath, quiet=True)
+        except RuntimeError:
+            return False
+    return True
+
+
+class CurvesImporter(object):
+    """
+    Import curves from a json file without blocking maya. The file is read and decoded in a thread, then curves are
+    applied in time-sliced batches whenever maya is idle, with undo disabled. Each controller's curves are recorded
+    before being replaced, and once done a single ctrlShaperApplyCurves command makes the whole import one undo step.
+    Controllers waiting to be imported can't be edited meanwhile (see isImportLocked).
+    """
+    lockedCtrls = set()
+    applying = False
+
+    def __init__(self, filePath, selectionFilter=tuple(), shapes=True, color=True, budget=.02, progress=None,
+                 finished=None):
+        """
+        :param filePath: (str)
+        :param selectionFilter: list of objects that will be affected by the importation (List[str])
+        :param shapes: apply shapes (bool)
+        :param color: apply colors (bool)
+        :param budget: maximum time spent applying curves per idle slice, in seconds (float)
+        :param progress: called with the number of applied and total controllers after each slice (callable)
+        :param finished: called with the number of found controllers once done, even on failure (callable)
+        """
+        self.filePath = filePath
+        self.selectionFilter = selectionFilter
+        self.shapes = shapes
+        self.color = color
+        self.budget = budget
+        self.progress = progress
+        self.finished = finished
+
+        self.items = list()
+        self.index = 0
+        self.records = list()
+        self.locked = set()
+        self.running = False
+
+    def start(self):
+        if self.running:
+            return
+        self.running = True
+
+        thread = threading.Thread(target=self._read)
+        thread.daemon = True
+        thread.start()
+
+    def _read(self):
+        try:
+            data = readCurvesFile(self.filePath)
+            items = [(n, d) for n, d in sorted(data.items()) if not self.selectionFilter or n in self.selectionFilter]
+        except Exception as e:
+            maya.utils.executeDeferred(cmds.warning, 'Unable to read {}: {}'.format(repr(self.filePath), e))
+            maya.utils.executeDeferred(self._finish)
+            return
+
+        maya.utils.executeDeferred(self._begin, items)
+
+    def _begin(self, items):
+        try:
+            self.items = items
+            self.locked = set(cmds.ls([n for n, _ in items], long=True) or list()) if items else set()
+            self.locked -= CurvesImporter.lockedCtrls
+            CurvesImporter.lockedCtrls |= self.locked
+        except Exception:
+            self._finish()
+            raise
+
+        self._applySlice()
+
+    def _applySlice(self):
+        start = time.time()
+
+        try:
+            CurvesImporter.applying = True
+            with NoUndo():
+                while self.index < len(self.items) and time.time() - start < self.budget:
+                    n, d = self.items[self.index]
+                    self.index += 1
+                    if not cmds.objExists(n):
+                        cmds.warning('Unable to find {}. Skip...'.format(repr(n)))
+                        continue
+                    before = getCurvesData(n)
+                    importCurve(n, d, shapes=self.shapes, color=self.color)
+                    self.records.append((n, before, d, self.shapes, self.color))
+            CurvesImporter.applying = False
+
+            self.progress(self.index, len(self.items)) if self.progress else None
+        except Exception:
+            CurvesImporter.applying = False
+            self._finish()
+            raise
+
+        if self.index < len(self.items):
+            maya.utils.executeDeferred(self._applySlice)
+        else:
+            self._finish()
+
+    def _finish(self):
+        self.running = False
+        CurvesImporter.lockedCtrls -= self.locked
+        self.locked = set()
 
-        replaceCurves(n, d, applyColor=color, applyShapes=shapes)
+        try:
+            self.finished(len(self.records)) if self.finished else None
+        finally:
+            if self.records:
+                _appliedCurves.append(self.records)
+                if loadCurvesCommand():
+                    cmds.ctrlShaperApplyCurves()
+                else:
+                    _appliedCurves.remove(self.records)
+                    cmds.warning('Unable to load the curves command. The import can\'t be undone.')
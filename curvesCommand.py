@@ -0,0 +1,51 @@
+"""
+Maya plugin registering the undoable command pushed by core.CurvesImporter once an import is done. Curves are applied
+with undo disabled while importing, this command then makes the whole import a single undo step.
+"""
+from maya import cmds
+from maya.api import OpenMaya
+from ctrlShaper import core
+
+
+def maya_useNewAPI():
+    pass
+
+
+class ApplyCurvesCommand(OpenMaya.MPxCommand):
+    """
+    Undo/redo of curves that were already applied. Its records are taken from core.popAppliedCurves.
+    """
+    name = 'ctrlShaperApplyCurves'
+
+    def __init__(self):
+        super(ApplyCurvesCommand, self).__init__()
+        self.records = list()
+
+    @classmethod
+    def creator(cls):
+        return cls()
+
+    def isUndoable(self):
+        return True
+
+    def doIt(self, args):
+        # curves are already applied, only keep what's needed to undo/redo them
+        self.records = core.popAppliedCurves()
+
+    def undoIt(self):
+        with core.NoUndo():
+            for ctrl, before, data, shapes, color in reversed(self.records):
+                core.replaceCurves(ctrl, before, applyColor=True, applyShapes=True) if cmds.objExists(ctrl) else None
+
+    def redoIt(self):
+        with core.NoUndo():
+            for ctrl, before, data, shapes, color in self.records:
+                core.importCurve(ctrl, data, shapes=shapes, color=color)
+
+
+def initializePlugin(plugin):
+    OpenMaya.MFnPlugin(plugin).registerCommand(ApplyCurvesCommand.name, ApplyCurvesCommand.creator)
+
+
+def uninitializePlugin(plugin):
+    OpenMaya.MFnPlugin(plugin).deregisterCommand(ApplyCurvesCommand.name)
@@ -1,21 +1,41 @@
+import time
+_importStart = time.time()
+
 import webbrowser
+import hashlib
+import json
+import math
+import os
 
-from PySide2.QtCore import Qt, QSize
-from PySide2.QtGui import QIcon, QPixmap, QColor
+from PySide2.QtCore import Qt, QSize, QPointF
+from PySide2.QtGui import QIcon, QPixmap, QColor, QPainter, QPen, QPolygonF
 from PySide2.QtWidgets import QMainWindow, QHBoxLayout, QVBoxLayout, QPushButton, QGridLayout, QColorDialog, \
     QComboBox, QLabel, QDoubleSpinBox, QDialog, QCheckBox, QFrame, QApplication, QLineEdit, QFileDialog, QMenuBar,\
-    QMenu, QAction
-from ctrlShaper.core import setOverrideColors, chunk, replaceCurves, scaleCurves, getCurvesData, importCurves, \
-    exportCurves
-from maya import OpenMayaUI, cmds
-import shiboken2
+    QMenu, QAction, QWidget, QToolButton, QProgressBar
+from ctrlShaper.core import setOverrideColors, chunk, replaceCurves, scaleCurves, getCurvesData, CurvesImporter, \
+    exportCurves, getLibraryShapes, replaceShapes, mirrorCurves, tagControllers, getTaggedControllers, \
+    orientPoints, sampleCurve, simplifyCurves
+from maya import cmds
 from functools import partial
-import json
-import os
-from maya.api.OpenMaya import MMatrix
 
 
-dpiF = QApplication.desktop().logicalDpiX() / 96.0
+# startup timings in seconds: 'import', 'open' and 'section.<title>' for each built section
+timings = dict()
+
+_dpiF = None
+_colorIcons = dict()
+_shapeIcons = dict()
+_thumbnailsWritable = True
+
+# bump to invalidate the thumbnails saved on disk when their rendering changes
+thumbnailVersion = 2
+
+
+def getDpiFactor():
+    global _dpiF
+    if _dpiF is None:
+        _dpiF = QApplication.desktop().logicalDpiX() / 96.0
+    return _dpiF
 
 
 def killOtherInstances(self):
@@ -28,6 +48,9 @@ def killOtherInstances(self):
 
 
 def getMayaMainWindow():
+    from maya import OpenMayaUI
+    import shiboken2
+
     pointer = OpenMayaUI.MQtUtil.mainWindow()
     return shiboken2.wrapInstance(int(pointer), QMainWindow)
 
@@ -39,6 +62,122 @@ def createSeparator():
     return separator
 
 
+def getColorIcon(color):
+    """
+    Get a plain color icon. Icons are cached for the whole session.
+    :param color: rgb color (Tuple[int, int, int])
+    :return: (QIcon)
+    """
+    icon = _colorIcons.get(color)
+    if icon is None:
+        dpiF = getDpiFactor()
+        pixmap = QPixmap(20 * dpiF, 20 * dpiF)
+        pixmap.fill(QColor(*color))
+
+        icon = QIcon()
+        icon.addPixmap(pixmap)
+        _colorIcons[color] = icon
+    return icon
+
+
+def getThumbnailsDir():
+    return os.path.join(cmds.internalVar(userAppDir=True), 'ctrlShaper', 'thumbnails')
+
+
+def renderShapeThumbnail(data, axes='y', size=64):
+    """
+    Draw a shape seen from a three-quarter point of view.
+    :param data: shape data (dict)
+    :param axes: controller's facing axes (str) -> 'x', 'y', 'z'
+    :param size: width and height in pixels (int)
+    :return: (QPixmap)
+    """
+    points = orientPoints(data.get('points', tuple()), axes)
+    points = sampleCurve(points, degree=data.get('degree', 1), periodic=data.get('periodic', False))
+
+    # three-quarter view, off the diagonal so that 'x' and 'z' normals look different
+    yaw, pitch = math.radians(30), math.radians(30)
+    projected = list()
+    for x, y, z in points:
+        x, z = x * math.cos(yaw) - z * math.sin(yaw), x * math.sin(yaw) + z * math.cos(yaw)
+        projected.append((x, y * math.cos(pitch) - z * math.sin(pitch)))
+
+    pixmap = QPixmap(size, size)
+    pixmap.fill(Qt.transparent)
+    if not projected:
+        return pixmap
+
+    us, vs = zip(*projected)
+    extent = max(max(us) - min(us), max(vs) - min(vs)) or 1.0
+    margin = size * .1
+    factor = (size - 2 * margin) / extent
+    centerU, centerV = (max(us) + min(us)) * .5, (max(vs) + min(vs)) * .5
+    polygon = QPolygonF([QPointF(size * .5 + (u - centerU) * factor, size * .5 - (v - centerV) * factor) for u, v in projected])
+
+    painter = QPainter(pixmap)
+    painter.setRenderHint(QPainter.Antialiasing)
+    painter.setPen(QPen(QColor(200, 200, 200), max(1.0, size / 40.0)))
+    painter.drawPolyline(polygon)
+    painter.end()
+
+    return pixmap
+
+
+def saveThumbnail(pixmap, path):
+    """
+    Save a thumbnail to the disk cache. If the cache can't be written, thumbnails are only kept in memory for the rest
+    of the session.
+    :param pixmap: (QPixmap)
+    :param path: (str)
+    :return: True if saved (bool)
+    """
+    global _thumbnailsWritable
+    if not _thumbnailsWritable:
+        return False
+
+    try:
+        if not os.path.isdir(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+        saved = pixmap.save(path, 'PNG')
+    except OSError:
+        saved = False
+
+    if not saved:
+        _thumbnailsWritable = False
+        cmds.warning('Unable to save thumbnails in {}. They will only be kept in memory.'.format(repr(os.path.dirname(path))))
+    return saved
+
+
+def getShapeIcon(data, axes='y', size=64):
+    """
+    Get a shape's thumbnail. Thumbnails are cached on disk by content hash, so they are only rendered again when the
+    shape changes.
+    :param data: shape data (dict)
+    :param axes: controller's facing axes (str) -> 'x', 'y', 'z'
+    :param size: width and height in pixels (int)
+    :return: (QIcon)
+    """
+    content = json.dumps(
+        [thumbnailVersion, data.get('points'), data.get('degree', 1), data.get('periodic', False), axes, size],
+        sort_keys=True
+    )
+    key = hashlib.md5(content.encode('utf-8')).hexdigest()
+
+    icon = _shapeIcons.get(key)
+    if icon is not None:
+        return icon
+
+    path = os.path.join(getThumbnailsDir(), '{}.png'.format(key))
+    pixmap = QPixmap(path) if os.path.isfile(path) else QPixmap()
+    if pixmap.isNull():
+        pixmap = renderShapeThumbnail(data, axes=axes, size=size)
+        saveThumbnail(pixmap, path)
+
+    icon = QIcon(pixmap)
+    _shapeIcons[key] = icon
+    return icon
+
+
 class ColorButton(QPushButton):
 
     def __init__(self, color):
@@ -48,36 +187,131 @@ class ColorButton(QPushButton):
         self.clicked.connect(partial(setOverrideColors, self.color))
 
         if color:
-            pixmap = QPixmap(20 * dpiF, 20 * dpiF)
-            pixmap.fill(QColor(*color))
-
-            icon = QIcon()
-            icon.addPixmap(pixmap)
-
-            self.setIcon(icon)
+            self.setIcon(getColorIcon(tuple(color)))
         else:
             self.setIcon(QIcon(':error.png'))
 
 
+class Section(QWidget):
+    """
+    Collapsible section. Its content is only built the first time it gets expanded.
+    """
+
+    def __init__(self, title, builder, expanded=False):
+        """
+        :param title: (str)
+        :param builder: callable returning the content's layout (QLayout)
+        :param expanded: (bool)
+        """
+        super(Section, self).__init__()
+
+        self.title = title
+        self.builder = builder
+        self.content = None
+
+        self.toggle = QToolButton()
+        self.toggle.setText(title)
+        self.toggle.setStyleSheet('QToolButton { border: none; font-weight: bold; }')
+        self.toggle.setToolButtonStyle(Qt.ToolButtonTextBesideIcon)
+        self.toggle.setArrowType(Qt.RightArrow)
+        self.toggle.setCheckable(True)
+        self.toggle.toggled.connect(self.setExpanded)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(self.toggle)
+
+        self.toggle.setChecked(expanded)
+
+    def build(self):
+        if self.content is not None:
+            return
+
+        start = time.time()
+        contentLayout = self.builder()
+        contentLayout.setContentsMargins(0, 0, 0, 0)
+        self.content = QWidget()
+        self.content.setLayout(contentLayout)
+        self.layout().addWidget(self.content)
+        timings['section.{}'.format(self.title)] = time.time() - start
+
+    def setExpanded(self, expanded):
+        self.toggle.setArrowType(Qt.DownArrow if expanded else Qt.RightArrow)
+
+        if expanded:
+            self.build()
+
+        if self.content is not None:
+            self.content.setVisible(expanded)
+
+        self.window().adjustSize() if self.window() is not self else None
+
+
 class CtrlShaper(QDialog):
 
-    def __init__(self, parent=getMayaMainWindow()):
-        super(CtrlShaper, self).__init__(parent=parent)
+    def __init__(self, parent=None):
+        start = time.time()
+        super(CtrlShaper, self).__init__(parent=parent or getMayaMainWindow())
         killOtherInstances(self)
         self.setWindowFlags(self.windowFlags() & ~Qt.WindowContextHelpButtonHint)
         self.setWindowTitle('Controller Shaper 1.0')
 
+        # shared options
+        self.copiedShapeData = None
+        self.importer = None
+
+        self.applyColor = QCheckBox()
+        self.applyColor.setChecked(True)
+
+        self.applyShape = QCheckBox()
+        self.applyShape.setChecked(True)
+
+        # menu
+        documentationUrl = 'https://github.com/Noboxxx/ctrlShaper'
+        docAction = QAction('Documentation', self)
+        docAction.setIcon(QIcon(':help.png'))
+        docAction.triggered.connect(partial(webbrowser.open, documentationUrl))
+
+        helpMenu = QMenu('Help')
+        helpMenu.addAction(docAction)
+
+        menuBar = QMenuBar()
+        menuBar.addMenu(helpMenu)
+
+        # main layout
+        mainLayout = QVBoxLayout(self)
+        mainLayout.setMenuBar(menuBar)
+        mainLayout.setAlignment(Qt.AlignTop)
+
+        sections = (
+            ('Color', self.buildColorLayout, True),
+            ('Shape', self.buildShapeLayout, True),
+            ('Controller', self.buildControllerLayout, False),
+            ('Tag', self.buildTagLayout, False),
+            ('Transform', self.buildTransformLayout, False),
+            ('Copy/Export', self.buildCopyPasteLayout, False),
+            ('Search and Replace', self.buildSearchReplaceLayout, False),
+            ('Mirror', self.buildMirrorLayout, False),
+        )
+        for i, (title, builder, expanded) in enumerate(sections):
+            mainLayout.addWidget(createSeparator()) if i else None
+            mainLayout.addWidget(Section(title, builder, expanded=expanded))
+
+        timings['open'] = time.time() - start
+
+    def buildShapeLayout(self):
         # shapes
-        shapesDir = os.path.dirname(os.path.abspath(__file__))
-        with open('{}/src/shapes.json'.format(shapesDir), 'r') as f:
-            shapesData = json.load(f)
+        shapesData = getLibraryShapes()
 
         # shape
         self.axeShapeCombo = QComboBox()
         [self.axeShapeCombo.addItem(i) for i in ('x', 'y', 'z')]
 
         self.shapeCombo = QComboBox()
+        self.shapeCombo.setIconSize(QSize(32 * getDpiFactor(), 32 * getDpiFactor()))
         [self.shapeCombo.addItem(name, userData=data) for name, data in sorted(shapesData.items())]
+        self.updateShapeIcons()
+        self.axeShapeCombo.currentIndexChanged.connect(self.updateShapeIcons)
 
         self.shapeScale = QDoubleSpinBox()
         self.shapeScale.setMinimum(0)
@@ -85,6 +319,9 @@ class CtrlShaper(QDialog):
         self.shapeScale.setValue(1)
         self.shapeScale.setSingleStep(.1)
 
+        self.shapeFit = QComboBox()
+        [self.shapeFit.addItem(label, userData=fit) for label, fit in (('fixed', ''), ('curves', 'curves'), ('driven', 'driven'))]
+
         shapeOptionsLayout = QGridLayout()
         shapeOptionsLayout.addWidget(QLabel('Shape'), 0, 0)
         shapeOptionsLayout.addWidget(self.shapeCombo, 0, 1)
@@ -92,6 +329,8 @@ class CtrlShaper(QDialog):
         shapeOptionsLayout.addWidget(self.axeShapeCombo, 1, 1)
         shapeOptionsLayout.addWidget(QLabel('Scale'), 2, 0)
         shapeOptionsLayout.addWidget(self.shapeScale, 2, 1)
+        shapeOptionsLayout.addWidget(QLabel('Fit'), 3, 0)
+        shapeOptionsLayout.addWidget(self.shapeFit, 3, 1)
 
         replaceBtn = QPushButton('Replace')
         replaceBtn.clicked.connect(self.replaceShape)
@@ -99,8 +338,15 @@ class CtrlShaper(QDialog):
         shapeLayout = QVBoxLayout()
         shapeLayout.addLayout(shapeOptionsLayout)
         shapeLayout.addWidget(replaceBtn)
+        return shapeLayout
+
+    def updateShapeIcons(self, *args):
+        axes = self.axeShapeCombo.currentText()
+        size = self.shapeCombo.iconSize().width()
+        for i in range(self.shapeCombo.count()):
+            self.shapeCombo.setItemIcon(i, getShapeIcon(self.shapeCombo.itemData(i), axes=axes, size=size))
 
-        # Create Controller
+    def buildControllerLayout(self):
         createCtrlBtn = QPushButton('Create')
         createCtrlBtn.clicked.connect(self.createControllers)
 
@@ -119,8 +365,9 @@ class CtrlShaper(QDialog):
         createControllerLayout = QVBoxLayout()
         createControllerLayout.addLayout(nameLayout)
         createControllerLayout.addWidget(createCtrlBtn)
+        return createControllerLayout
 
-        # tag
+    def buildTagLayout(self):
         selectAllBtn = QPushButton('Select All')
         selectAllBtn.clicked.connect(self.selectTaggedControllers)
 
@@ -130,30 +377,26 @@ class CtrlShaper(QDialog):
         tagLayout = QGridLayout()
         tagLayout.addWidget(setTagBtn)
         tagLayout.addWidget(selectAllBtn, 0, 1)
+        return tagLayout
 
-        # copy paste
-        self.copiedShapeData = None
-
-        self.applyColor = QCheckBox()
-        self.applyColor.setChecked(True)
-
-        self.applyShape = QCheckBox()
-        self.applyShape.setChecked(True)
-
+    def buildCopyPasteLayout(self):
         copyBtn = QPushButton('Copy')
         copyBtn.clicked.connect(self.copyShapes)
 
         self.pasteBtn = QPushButton('Paste')
-        self.pasteBtn.setEnabled(False)
+        self.pasteBtn.setEnabled(self.copiedShapeData is not None)
         self.pasteBtn.clicked.connect(self.pasteShapes)
 
         export = QPushButton('Export')
         export.setIcon(QIcon(':fileSave.png'))
         export.clicked.connect(self.exportShapes)
 
-        import_ = QPushButton('Import')
-        import_.setIcon(QIcon(':fileOpen.png'))
-        import_.clicked.connect(self.importShapes)
+        self.importBtn = QPushButton('Import')
+        self.importBtn.setIcon(QIcon(':fileOpen.png'))
+        self.importBtn.clicked.connect(self.importShapes)
+
+        self.importProgress = QProgressBar()
+        self.importProgress.setVisible(False)
 
         copyPasteLayout = QGridLayout()
         copyPasteLayout.addWidget(QLabel('Apply Color'), 0, 0)
@@ -163,9 +406,11 @@ class CtrlShaper(QDialog):
         copyPasteLayout.addWidget(copyBtn, 2, 0)
         copyPasteLayout.addWidget(self.pasteBtn, 2, 1)
         copyPasteLayout.addWidget(export, 3, 0)
-        copyPasteLayout.addWidget(import_, 3, 1)
+        copyPasteLayout.addWidget(self.importBtn, 3, 1)
+        copyPasteLayout.addWidget(self.importProgress, 4, 0, 1, 2)
+        return copyPasteLayout
 
-        # search and replace
+    def buildSearchReplaceLayout(self):
         self.searchLine = QLineEdit('search')
         self.replaceLine = QLineEdit('replace')
         searchReplaceBtn = QPushButton('Replace')
@@ -175,8 +420,9 @@ class CtrlShaper(QDialog):
         searchReplaceLayout.addWidget(self.searchLine, 0, 0)
         searchReplaceLayout.addWidget(self.replaceLine, 0, 1)
         searchReplaceLayout.addWidget(searchReplaceBtn, 1, 0)
+        return searchReplaceLayout
 
-        # color
+    def buildColorLayout(self):
         colorDialogBtn = QPushButton('Custom')
         colorDialogBtn.setIcon(QIcon(':colorProfile.png'))
         colorDialogBtn.clicked.connect(self.openColorDialog)
@@ -207,8 +453,11 @@ class CtrlShaper(QDialog):
         colorLayout = QVBoxLayout()
         colorLayout.addLayout(favColorLayout)
         colorLayout.addLayout(colorSpecialLayout)
+        return colorLayout
+
+    def buildTransformLayout(self):
+        dpiF = getDpiFactor()
 
-        # transform
         scaleMinusBtn = QPushButton('-')
         scaleMinusBtn.setFixedSize(QSize(16 * dpiF, 16 * dpiF))
         scaleMinusBtn.clicked.connect(partial(self.scaleShape, False))
@@ -227,11 +476,29 @@ class CtrlShaper(QDialog):
         scaleValueLayout.addWidget(self.scaleFactor)
         scaleValueLayout.addWidget(scalePlusBtn)
 
+        self.simplifyTolerance = QDoubleSpinBox()
+        self.simplifyTolerance.setDecimals(3)
+        self.simplifyTolerance.setMinimum(.001)
+        self.simplifyTolerance.setValue(.01)
+        self.simplifyTolerance.setSingleStep(.005)
+
+        simplifyBtn = QPushButton('Simplify')
+        simplifyBtn.clicked.connect(self.simplifyShape)
+
+        simplifyLayout = QHBoxLayout()
+        simplifyLayout.addWidget(self.simplifyTolerance)
+        simplifyLayout.addWidget(simplifyBtn)
+
         scaleLayout = QGridLayout()
         scaleLayout.addWidget(QLabel('Scale'), 0, 0)
         scaleLayout.addLayout(scaleValueLayout, 0, 1)
+        scaleLayout.addWidget(QLabel('Tolerance'), 1, 0)
+        scaleLayout.addLayout(simplifyLayout, 1, 1)
+        return scaleLayout
+
+    def buildMirrorLayout(self):
+        dpiF = getDpiFactor()
 
-        # mirror
         self.mirrorAxes = QComboBox()
         [self.mirrorAxes.addItem(axes) for axes in ('x', 'y', 'z', '')]
 
@@ -264,64 +531,17 @@ class CtrlShaper(QDialog):
         mirrorLayout = QVBoxLayout()
         mirrorLayout.addLayout(mirrorReplaceLayout)
         mirrorLayout.addWidget(mirrorBtn)
-
-        # menu
-        documentationUrl = 'https://github.com/Noboxxx/ctrlShaper'
-        docAction = QAction('Documentation', self)
-        docAction.setIcon(QIcon(':help.png'))
-        docAction.triggered.connect(partial(webbrowser.open, documentationUrl))
-
-        helpMenu = QMenu('Help')
-        helpMenu.addAction(docAction)
-
-        menuBar = QMenuBar()
-        menuBar.addMenu(helpMenu)
-
-        # main layout
-        mainLayout = QVBoxLayout(self)
-        mainLayout.setMenuBar(menuBar)
-        mainLayout.setAlignment(Qt.AlignTop)
-
-        mainLayout.addWidget(QLabel('<b>Color</b>'))
-        mainLayout.addLayout(colorLayout)
-
-        mainLayout.addWidget(createSeparator())
-        mainLayout.addWidget(QLabel('<b>Shape</b>'))
-        mainLayout.addLayout(shapeLayout)
-
-        mainLayout.addWidget(createSeparator())
-        mainLayout.addWidget(QLabel('<b>Controller</b>'))
-        mainLayout.addLayout(createControllerLayout)
-
-        mainLayout.addWidget(createSeparator())
-        mainLayout.addWidget(QLabel('<b>Tag</b>'))
-        mainLayout.addLayout(tagLayout)
-
-        mainLayout.addWidget(createSeparator())
-        mainLayout.addWidget(QLabel('<b>Transform</b>'))
-        mainLayout.addLayout(scaleLayout)
-
-        mainLayout.addWidget(createSeparator())
-        mainLayout.addWidget(QLabel('<b>Copy/Export</b>'))
-        mainLayout.addLayout(copyPasteLayout)
-
-        mainLayout.addWidget(createSeparator())
-        mainLayout.addWidget(QLabel('<b>Search and Replace</b>'))
-        mainLayout.addLayout(searchReplaceLayout)
-
-        mainLayout.addWidget(createSeparator())
-        mainLayout.addWidget(QLabel('<b>Mirror</b>'))
-        mainLayout.addLayout(mirrorLayout)
+        return mirrorLayout
 
     def setTag(self):
         selection = cmds.ls(sl=True, type='transform', long=True)
         if not selection:
             return cmds.warning('Nothing valid selected.')
-        cmds.controller(selection)
+        tagControllers(selection)
 
     def selectTaggedControllers(self):
-        ctrls = cmds.controller(q=True, allControllers=True)
-        cmds.select(ctrls)
+        ctrls = getTaggedControllers()
+        cmds.select(ctrls) if ctrls else cmds.select(clear=True)
 
     def getUniqueName(self, pattern, dag=''):
         name = ''
@@ -351,7 +571,7 @@ class CtrlShaper(QDialog):
         bfr_ = cmds.group(empty=True, name='{}Bfr'.format(name))
         cmds.parent(ctl, bfr_)
 
-        cmds.controller(ctl)
+        tagControllers([ctl])
 
         replaceCurves(ctl, [shapeData], applyColor=False)
 
@@ -416,12 +636,10 @@ class CtrlShaper(QDialog):
             cmds.warning('Nothing valid is selected.')
             return
 
-        for dag in selection:
-            data = self.shapeCombo.currentData()
-            data['axes'] = self.axeShapeCombo.currentText()
-            data['scale'] = self.shapeScale.value()
+        data = dict(self.shapeCombo.currentData())
+        data['axes'] = self.axeShapeCombo.currentText()
 
-            replaceCurves(dag, [data], applyColor=False)
+        replaceShapes(selection, data, scale=self.shapeScale.value(), fit=self.shapeFit.currentData())
 
         cmds.select(selection)
 
@@ -431,6 +649,18 @@ class CtrlShaper(QDialog):
         factor = 1 + off if scaleUp else 1 - off
         scaleCurves(cmds.ls(sl=True, dag=True, long=True), factor)
 
+    def simplifyShape(self):
+        selection = cmds.ls(sl=True, long=True, type='transform')
+
+        if not selection:
+            cmds.warning('Nothing valid is selected.')
+            return
+
+        simplified = simplifyCurves(selection, tolerance=self.simplifyTolerance.value())
+        cmds.select(selection)
+
+        print('{} controller(s) simplified.'.format(len(simplified)))
+
     def copyShapes(self):
         selection = cmds.ls(sl=True, long=True, type='transform')
         if not selection:
@@ -486,35 +716,7 @@ class CtrlShaper(QDialog):
     @chunk
     def mirrorShapes(self):
         selection = cmds.ls(sl=True, type='transform')
-        for dag in selection:
-            mirrorName = dag.replace(self.searchFor.text(), self.replaceBy.text())
-            if not cmds.objExists(mirrorName) or mirrorName == dag:
-                cmds.warning('No mirror object found')
-                continue
-
-            data = getCurvesData(dag, objectSpace=False)
-
-            mirrorAxis = self.mirrorAxes.currentText()
-
-            mirrorMatrix = MMatrix(cmds.xform(mirrorName, q=True, matrix=True, worldSpace=True)).inverse()
-            for d in data:
-                points = list()
-                for x, y, z in d['points']:
-                    if mirrorAxis == 'x':
-                        worldPoint = MMatrix((1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1, 0, -x, y, z, 1))
-                    elif mirrorAxis == 'y':
-                        worldPoint = MMatrix((1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1, 0, x, -y, z, 1))
-                    elif mirrorAxis == 'z':
-                        worldPoint = MMatrix((1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1, 0, x, y, -z, 1))
-                    elif mirrorAxis == '':
-                        worldPoint = MMatrix((1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1, 0, x, y, z, 1))
-                    else:
-                        raise ValueError
-                    resultMatrix = worldPoint * mirrorMatrix
-                    points.append((list(resultMatrix)[12:15]))
-                d['points'] = points
-
-            replaceCurves(mirrorName, data, applyColor=False)
+        mirrorCurves(selection, search=self.searchFor.text(), replace=self.replaceBy.text(), axis=self.mirrorAxes.currentText())
         cmds.select(selection)
 
     def swapSearchReplace(self):
@@ -524,7 +726,6 @@ class CtrlShaper(QDialog):
         self.searchFor.setText(replaceBy)
         self.replaceBy.setText(searchFor)
 
-    @chunk
     def importShapes(self):
         applyColor = self.applyColor.isChecked()
         applyShape = self.applyShape.isChecked()
@@ -540,10 +741,29 @@ class CtrlShaper(QDialog):
             return
 
         selection = cmds.ls(sl=True)
-        importCurves(path, selectionFilter=selection, shapes=applyShape, color=applyColor)
-        cmds.select(selection)
 
-        print('{} imported.'.format(path))
+        self.importBtn.setEnabled(False)
+        self.importProgress.setValue(0)
+        self.importProgress.setVisible(True)
+
+        self.importer = CurvesImporter(
+            path, selectionFilter=selection, shapes=applyShape, color=applyColor, progress=self.importProgressed,
+            finished=partial(self.importFinished, path, selection)
+        )
+        self.importer.start()
+
+    def importProgressed(self, done, total):
+        self.importProgress.setMaximum(total or 1)
+        self.importProgress.setValue(done)
+
+    def importFinished(self, path, selection, found):
+        cmds.select(cmds.ls(selection)) if selection else cmds.select(clear=True)
+
+        self.importProgress.setVisible(False)
+        self.importBtn.setEnabled(True)
+        self.importer = None
+
+        print('{} imported ({} controller(s)).'.format(path, found))
 
     def exportShapes(self):
         path, _ = QFileDialog.getSaveFileName(self, caption='Export Shapes', filter='Controller Shapes (*.ctrl)')
@@ -555,3 +775,6 @@ class CtrlShaper(QDialog):
         exportCurves(cmds.ls(sl=True), path)
 
         print('{} saved.'.format(path))
+
+
+timings['import'] = time.time() - _importStart